@@ -1,14 +1,78 @@
+import orjson
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
-# Create async engine
+
+def _read_only_url(url: str) -> str:
+    """Build a mode=ro file-URI variant of a sqlite+aiosqlite URL"""
+    prefix = "sqlite+aiosqlite:///"
+    if url.startswith(prefix) and "mode=" not in url:
+        return f"{prefix}file:{url[len(prefix):]}?mode=ro&uri=true"
+    return url
+
+
+# Create async engine. A one-connection queue pool keeps the SQLite page
+# cache warm like StaticPool did, but checkout blocking gives every session
+# exclusive use of the connection — concurrent writers queue instead of
+# interleaving transactions on a shared connection.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=True,
-    future=True
+    future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=1,
+    max_overflow=0,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False},
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite on every new connection (WAL, relaxed fsync, bigger cache)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# Separate pool of read-only connections so analytics reads never queue
+# behind the shared writer connection
+read_engine = create_async_engine(
+    _read_only_url(settings.DATABASE_URL),
+    echo=True,
+    future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=8,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
 )
 
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def set_read_only_pragmas(dbapi_connection, connection_record):
+    """Tune read-only connections and reject accidental writes"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -16,6 +80,13 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Session factory bound to the read-only pool
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -33,7 +104,16 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db():
+    """Dependency for read-only sessions used by analytics queries"""
+    async with read_session_maker() as session:
+        yield session
+
+
 async def init_db():
-    """Initialize database tables"""
+    """Initialize database tables and rebuild the dashboard counters"""
+    from app.models.stats import refresh_stats
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(lambda sync_conn: refresh_stats(sync_conn))
@@ -1,7 +1,18 @@
-from fastapi import FastAPI
+import hashlib
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
+try:
+    # uvloop ships with uvicorn[standard] on Linux/macOS; fall back to the
+    # stock asyncio loop where it is unavailable
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from app.config import settings
 from app.database import init_db
 from app.routes import accounts, transactions, budgets, investments, analytics, import_export
@@ -18,7 +29,8 @@ app = FastAPI(
     title="Personal Finance Dashboard API",
     description="Self-hosted personal finance management API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -30,6 +42,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Dashboard polls these read endpoints; ETag revalidation lets clients skip
+# identical payloads. no-cache (not no-store) keeps every response
+# revalidated: the SPA refetches these lists right after create/delete, so
+# any freshness window would serve the pre-mutation list from browser cache
+CACHEABLE_PREFIXES = ("/api/transactions", "/api/investments")
+CACHE_CONTROL = "private, no-cache"
+
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """Attach ETag/Cache-Control to cacheable GETs and answer 304s"""
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or not request.url.path.startswith(CACHEABLE_PREFIXES)
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'W/"{hashlib.sha256(body).hexdigest()}"'
+
+    # Carry the upstream headers (CORS among them) onto both branches;
+    # a bare 304 would fail cross-origin revalidation in the browser
+    headers = dict(response.headers)
+    headers["etag"] = etag
+    headers["cache-control"] = CACHE_CONTROL
+
+    if request.headers.get("if-none-match") == etag:
+        headers.pop("content-length", None)
+        return Response(status_code=304, headers=headers)
+
+    headers["content-length"] = str(len(body))
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=headers,
+        media_type=response.media_type
+    )
+
+
 # Include routers
 app.include_router(accounts.router)
 app.include_router(transactions.router)
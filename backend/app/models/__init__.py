@@ -1,6 +1,7 @@
 from app.models.account import Account
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionTag
 from app.models.budget import Budget
 from app.models.investment import Investment, InvestmentHolding
+from app.models.stats import Stat
 
-__all__ = ["Account", "Transaction", "Budget", "Investment", "InvestmentHolding"]
+__all__ = ["Account", "Transaction", "TransactionTag", "Budget", "Investment", "InvestmentHolding", "Stat"]
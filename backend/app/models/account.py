@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -25,21 +25,26 @@ class Account(Base):
     institution = Column(String, nullable=True)
     account_number = Column(String, nullable=True)
     notes = Column(String, nullable=True)
-    is_active = Column(Integer, default=1)  # SQLite uses INTEGER for boolean
+    is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Partial index so the is_active hot filter seeks instead of scanning
+    __table_args__ = (
+        Index("ix_accounts_active", "id", sqlite_where=is_active.is_(True)),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
             "name": self.name,
-            "account_type": self.account_type.value if self.account_type else None,
+            "account_type": self.account_type,
             "balance": self.balance,
             "currency": self.currency,
             "institution": self.institution,
             "account_number": self.account_number,
             "notes": self.notes,
-            "is_active": bool(self.is_active),
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "is_active": self.is_active,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
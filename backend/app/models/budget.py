@@ -23,6 +23,6 @@ class Budget(Base):
             "spent": self.spent,
             "remaining": self.amount - self.spent,
             "percentage_used": (self.spent / self.amount * 100) if self.amount > 0 else 0,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -21,6 +22,10 @@ class Investment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Eagerly loaded in one batched SELECT wherever investments are queried,
+    # so joining in the owning account never becomes an N+1
+    account = relationship("Account", lazy="selectin")
+
     def to_dict(self):
         cost_basis = self.quantity * self.purchase_price
         current_value = self.quantity * self.current_price
@@ -42,9 +47,9 @@ class Investment(Base):
             "current_value": current_value,
             "gain_loss": gain_loss,
             "gain_loss_percentage": gain_loss_pct,
-            "purchase_date": self.purchase_date.isoformat() if self.purchase_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "purchase_date": self.purchase_date,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
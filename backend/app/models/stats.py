@@ -0,0 +1,96 @@
+from sqlalchemy import Column, Integer, String, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.database import Base
+from app.models.account import Account
+from app.models.transaction import Transaction
+
+ACTIVE_ACCOUNT_COUNT = "active_account_count"
+
+
+class Stat(Base):
+    """Denormalized counters so the dashboard never runs COUNT(*) scans"""
+    __tablename__ = "stats"
+
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+def month_key(transaction_date) -> str:
+    """Counter key for transactions dated in the given month"""
+    return f"transactions:{transaction_date.strftime('%Y-%m')}"
+
+
+def stat_delta_stmt(key: str, delta: int):
+    """Upsert statement that adjusts a counter by delta"""
+    stmt = sqlite_insert(Stat).values(key=key, value=delta)
+    return stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": Stat.value + delta},
+    )
+
+
+def refresh_stats(connection) -> None:
+    """Recompute all counters from the base tables (run at startup)"""
+    connection.execute(Stat.__table__.delete())
+
+    active = connection.execute(
+        select(func.count(Account.id)).where(Account.is_active.is_(True))
+    ).scalar() or 0
+    connection.execute(sqlite_insert(Stat).values(key=ACTIVE_ACCOUNT_COUNT, value=active))
+
+    month_expr = func.strftime("%Y-%m", Transaction.transaction_date)
+    rows = connection.execute(
+        select(month_expr, func.count(Transaction.id)).group_by(month_expr)
+    ).all()
+    if rows:
+        connection.execute(
+            sqlite_insert(Stat),
+            [{"key": f"transactions:{month}", "value": count} for month, count in rows],
+        )
+
+
+@event.listens_for(Account, "after_insert")
+def _account_inserted(mapper, connection, target):
+    if target.is_active:
+        connection.execute(stat_delta_stmt(ACTIVE_ACCOUNT_COUNT, 1))
+
+
+@event.listens_for(Account, "after_delete")
+def _account_deleted(mapper, connection, target):
+    if target.is_active:
+        connection.execute(stat_delta_stmt(ACTIVE_ACCOUNT_COUNT, -1))
+
+
+@event.listens_for(Account, "after_update")
+def _account_updated(mapper, connection, target):
+    history = inspect(target).attrs.is_active.history
+    if not history.has_changes() or not history.deleted:
+        return
+    was_active = bool(history.deleted[0])
+    if was_active and not target.is_active:
+        connection.execute(stat_delta_stmt(ACTIVE_ACCOUNT_COUNT, -1))
+    elif not was_active and target.is_active:
+        connection.execute(stat_delta_stmt(ACTIVE_ACCOUNT_COUNT, 1))
+
+
+@event.listens_for(Transaction, "after_insert")
+def _transaction_inserted(mapper, connection, target):
+    connection.execute(stat_delta_stmt(month_key(target.transaction_date), 1))
+
+
+@event.listens_for(Transaction, "after_delete")
+def _transaction_deleted(mapper, connection, target):
+    connection.execute(stat_delta_stmt(month_key(target.transaction_date), -1))
+
+
+@event.listens_for(Transaction, "after_update")
+def _transaction_updated(mapper, connection, target):
+    history = inspect(target).attrs.transaction_date.history
+    if not history.has_changes() or not history.deleted:
+        return
+    old_key = month_key(history.deleted[0])
+    new_key = month_key(target.transaction_date)
+    if old_key != new_key:
+        connection.execute(stat_delta_stmt(old_key, -1))
+        connection.execute(stat_delta_stmt(new_key, 1))
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -12,6 +13,15 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Analytics filters on (type, date); budgets add category in front
+        Index("ix_tx_type_date", "transaction_type", "transaction_date"),
+        Index("ix_tx_cat_type_date", "category", "transaction_type", "transaction_date"),
+        # The transactions list orders by date; SQLite walks these backwards
+        # for DESC, so ASC declarations are enough
+        Index("ix_tx_date", "transaction_date"),
+        Index("ix_tx_acct_date", "account_id", "transaction_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
@@ -20,22 +30,47 @@ class Transaction(Base):
     category = Column(String, nullable=True)
     merchant = Column(String, nullable=True)
     description = Column(String, nullable=True)
-    tags = Column(String, nullable=True)  # Comma-separated tags
     transaction_date = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Batched into one extra SELECT per query instead of a lazy load per row
+    tag_rows = relationship(
+        "TransactionTag",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="TransactionTag.id"
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
             "account_id": self.account_id,
-            "transaction_type": self.transaction_type.value if self.transaction_type else None,
+            "transaction_type": self.transaction_type,
             "amount": self.amount,
             "category": self.category,
             "merchant": self.merchant,
             "description": self.description,
-            "tags": self.tags.split(",") if self.tags else [],
-            "transaction_date": self.transaction_date.isoformat() if self.transaction_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "tags": [row.tag for row in self.tag_rows],
+            "transaction_date": self.transaction_date,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
+
+
+class TransactionTag(Base):
+    """Normalized tag rows so tag filters hit an index, not a LIKE scan"""
+    __tablename__ = "transaction_tags"
+    __table_args__ = (
+        UniqueConstraint("transaction_id", "tag", name="uq_txtag_tx_tag"),
+        Index("ix_txtag_tag", "tag"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(
+        Integer,
+        ForeignKey("transactions.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    tag = Column(String, nullable=False)
@@ -1,17 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam, lambda_stmt
+from sqlalchemy.exc import IntegrityError
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.database import get_db
 from app.models.account import Account, AccountType
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 router = APIRouter(prefix="/api/accounts", tags=["accounts"])
 
+# Precompiled by-id lookup; the compiled SQL is cached on the lambda
+account_by_id_stmt = lambda_stmt(
+    lambda: select(Account).where(Account.id == bindparam("account_id"))
+)
+
 
 class AccountCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     name: str
     account_type: AccountType
     balance: float = 0.0
@@ -22,6 +30,10 @@ class AccountCreate(BaseModel):
 
 
 class AccountUpdate(BaseModel):
+    # No extra="forbid" here: the edit form posts its full form state, so
+    # unknown keys (account_type, currency, ...) must stay ignored
+    model_config = ConfigDict(frozen=True)
+
     name: str | None = None
     balance: float | None = None
     institution: str | None = None
@@ -33,15 +45,30 @@ class AccountUpdate(BaseModel):
 @router.get("")
 async def get_accounts(db: AsyncSession = Depends(get_db)):
     """Get all accounts"""
-    result = await db.execute(select(Account))
-    accounts = result.scalars().all()
-    return [account.to_dict() for account in accounts]
+    # Select columns directly to skip ORM instance construction per row;
+    # the column labels double as response keys so each row dict is built in C
+    result = await db.execute(
+        select(
+            Account.id,
+            Account.name,
+            Account.account_type,
+            Account.balance,
+            Account.currency,
+            Account.institution,
+            Account.account_number,
+            Account.notes,
+            Account.is_active,
+            Account.created_at,
+            Account.updated_at,
+        )
+    )
+    return [dict(row) for row in result.mappings()]
 
 
 @router.get("/{account_id}")
 async def get_account(account_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific account"""
-    result = await db.execute(select(Account).where(Account.id == account_id))
+    result = await db.execute(account_by_id_stmt, {"account_id": account_id})
     account = result.scalar_one_or_none()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
@@ -52,9 +79,10 @@ async def get_account(account_id: int, db: AsyncSession = Depends(get_db)):
 async def create_account(account_data: AccountCreate, db: AsyncSession = Depends(get_db)):
     """Create a new account"""
     account = Account(**account_data.model_dump())
+    # Set the timestamp locally so no refresh SELECT is needed for the response
+    account.created_at = datetime.now(timezone.utc)
     db.add(account)
     await db.flush()
-    await db.refresh(account)
     return account.to_dict()
 
 
@@ -65,29 +93,36 @@ async def update_account(
     db: AsyncSession = Depends(get_db)
 ):
     """Update an account"""
-    result = await db.execute(select(Account).where(Account.id == account_id))
+    result = await db.execute(account_by_id_stmt, {"account_id": account_id})
     account = result.scalar_one_or_none()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
     for key, value in account_data.model_dump(exclude_unset=True).items():
-        if key == "is_active":
-            setattr(account, key, 1 if value else 0)
-        else:
-            setattr(account, key, value)
+        setattr(account, key, value)
 
+    account.updated_at = datetime.now(timezone.utc)
     await db.flush()
-    await db.refresh(account)
     return account.to_dict()
 
 
 @router.delete("/{account_id}")
 async def delete_account(account_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an account"""
-    result = await db.execute(select(Account).where(Account.id == account_id))
+    result = await db.execute(account_by_id_stmt, {"account_id": account_id})
     account = result.scalar_one_or_none()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
     await db.delete(account)
+    try:
+        # Flush here so the FK check runs before the response is sent;
+        # otherwise the commit in get_db fails after a 200 already went out
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Account has transactions or investments and cannot be deleted"
+        )
     return {"message": "Account deleted successfully"}
@@ -1,46 +1,79 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, case
 from datetime import datetime, timedelta
 from typing import List, Dict
 
-from app.database import get_db
-from app.models.account import Account
+from app.database import get_read_db, read_session_maker
+from app.models.account import Account, AccountType
 from app.models.transaction import Transaction, TransactionType
 from app.models.investment import Investment
+from app.models.stats import Stat, ACTIVE_ACCOUNT_COUNT, month_key
 from app.services.market_data import MarketDataService
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
+ASSET_ACCOUNT_TYPES = [
+    AccountType.CHECKING,
+    AccountType.SAVINGS,
+    AccountType.INVESTMENT,
+    AccountType.CRYPTO,
+]
+LIABILITY_ACCOUNT_TYPES = [AccountType.CREDIT_CARD, AccountType.LOAN]
+
+
+def request_now() -> datetime:
+    """Resolve 'now' once per request for a consistent time snapshot"""
+    return datetime.now()
+
 
 @router.get("/net-worth")
-async def get_net_worth(db: AsyncSession = Depends(get_db)):
+async def get_net_worth(
+    db: AsyncSession = Depends(get_read_db),
+    now: datetime = Depends(request_now)
+):
     """Calculate total net worth (all accounts + investments)"""
-    # Get all accounts
-    result = await db.execute(select(Account))
-    accounts = result.scalars().all()
-
-    assets = 0.0
-    liabilities = 0.0
+    # Aggregate asset/liability balances server-side in one round-trip
+    result = await db.execute(
+        select(
+            func.sum(
+                case((Account.account_type.in_(ASSET_ACCOUNT_TYPES), Account.balance), else_=0.0)
+            ),
+            func.sum(
+                case(
+                    (Account.account_type.in_(LIABILITY_ACCOUNT_TYPES), func.abs(Account.balance)),
+                    else_=0.0,
+                )
+            ),
+        )
+    )
+    asset_sum, liability_sum = result.one()
 
-    for account in accounts:
-        if account.account_type.value in ["checking", "savings", "investment", "crypto"]:
-            assets += account.balance
-        elif account.account_type.value in ["credit_card", "loan"]:
-            liabilities += abs(account.balance)
+    assets = float(asset_sum or 0.0)
+    liabilities = float(liability_sum or 0.0)
 
-    # Get investment portfolio value
-    inv_result = await db.execute(select(Investment))
-    investments = inv_result.scalars().all()
+    # Collapse duplicate symbols before hitting the market data service
+    inv_result = await db.execute(
+        select(
+            Investment.symbol,
+            Investment.exchange,
+            func.sum(Investment.quantity).label("total_quantity"),
+            func.avg(Investment.current_price).label("last_price"),
+        )
+        .group_by(Investment.symbol, Investment.exchange)
+    )
+    holdings = inv_result.all()
 
-    if investments:
-        symbols = [{"symbol": inv.symbol, "exchange": inv.exchange} for inv in investments]
+    if holdings:
+        symbols = [{"symbol": h.symbol, "exchange": h.exchange} for h in holdings]
         prices = await MarketDataService.get_multiple_prices(symbols)
 
-        for inv in investments:
-            key = f"{inv.symbol}:{inv.exchange}"
-            current_price = prices.get(key, inv.current_price)
-            assets += inv.quantity * current_price
+        for h in holdings:
+            key = f"{h.symbol}:{h.exchange}"
+            current_price = prices.get(key) or h.last_price or 0.0
+            assets += h.total_quantity * current_price
 
     net_worth = assets - liabilities
 
@@ -48,7 +81,7 @@ async def get_net_worth(db: AsyncSession = Depends(get_db)):
         "net_worth": net_worth,
         "total_assets": assets,
         "total_liabilities": liabilities,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     }
 
 
@@ -56,13 +89,14 @@ async def get_net_worth(db: AsyncSession = Depends(get_db)):
 async def get_cash_flow(
     start_date: datetime | None = None,
     end_date: datetime | None = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    now: datetime = Depends(request_now)
 ):
     """Calculate cash flow (income vs expenses) for a period"""
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = now - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
+        end_date = now
 
     # Get income
     income_result = await db.execute(
@@ -105,18 +139,24 @@ async def get_cash_flow(
 async def get_spending_by_category(
     start_date: datetime | None = None,
     end_date: datetime | None = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    now: datetime = Depends(request_now)
 ):
     """Get spending breakdown by category"""
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = now - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
+        end_date = now
 
+    # Grand total and percentages computed in SQL via a window function
+    amount_sum = func.sum(Transaction.amount)
+    grand_total = func.sum(amount_sum).over()
     result = await db.execute(
         select(
             Transaction.category,
-            func.sum(Transaction.amount).label('total')
+            amount_sum.label('total'),
+            grand_total.label('grand_total'),
+            (amount_sum * 100.0 / grand_total).label('pct')
         )
         .where(
             and_(
@@ -127,22 +167,19 @@ async def get_spending_by_category(
             )
         )
         .group_by(Transaction.category)
-        .order_by(func.sum(Transaction.amount).desc())
+        .order_by(amount_sum.desc())
     )
 
     categories = []
+    total = 0.0
     for row in result:
+        total = float(row.grand_total)
         categories.append({
             "category": row.category,
-            "amount": float(row.total)
+            "amount": float(row.total),
+            "percentage": float(row.pct) if row.pct is not None else 0
         })
 
-    total = sum(cat["amount"] for cat in categories)
-
-    # Add percentage
-    for cat in categories:
-        cat["percentage"] = (cat["amount"] / total * 100) if total > 0 else 0
-
     return {
         "categories": categories,
         "total_spending": total,
@@ -154,47 +191,51 @@ async def get_spending_by_category(
 @router.get("/income-vs-expenses-trend")
 async def get_income_vs_expenses_trend(
     months: int = Query(default=6, ge=1, le=24),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    now: datetime = Depends(request_now)
 ):
     """Get monthly income vs expenses trend"""
-    end_date = datetime.now()
+    end_date = now
     start_date = end_date - timedelta(days=months * 30)
 
-    # Get all transactions in the period
+    # Aggregate by month in SQL; returns at most two rows per month
+    month_expr = func.strftime("%Y-%m", Transaction.transaction_date).label("month")
     result = await db.execute(
-        select(Transaction)
+        select(
+            month_expr,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount).label("total")
+        )
         .where(
             and_(
                 Transaction.transaction_date >= start_date,
                 Transaction.transaction_date <= end_date
             )
         )
-        .order_by(Transaction.transaction_date)
+        .group_by(month_expr, Transaction.transaction_type)
     )
-    transactions = result.scalars().all()
 
-    # Group by month
     monthly_data: Dict[str, Dict] = {}
 
-    for txn in transactions:
-        month_key = txn.transaction_date.strftime("%Y-%m")
-
-        if month_key not in monthly_data:
-            monthly_data[month_key] = {
-                "month": month_key,
+    # 'month', not 'month_key': that name is the function imported from
+    # app.models.stats and used further down in this module
+    for month, txn_type, total in result:
+        if month not in monthly_data:
+            monthly_data[month] = {
+                "month": month,
                 "income": 0.0,
                 "expenses": 0.0
             }
 
-        if txn.transaction_type == TransactionType.INCOME:
-            monthly_data[month_key]["income"] += txn.amount
-        elif txn.transaction_type == TransactionType.EXPENSE:
-            monthly_data[month_key]["expenses"] += txn.amount
+        if txn_type == TransactionType.INCOME:
+            monthly_data[month]["income"] = float(total)
+        elif txn_type == TransactionType.EXPENSE:
+            monthly_data[month]["expenses"] = float(total)
 
     # Convert to list and calculate net
     trend = []
-    for month_key in sorted(monthly_data.keys()):
-        data = monthly_data[month_key]
+    for month in sorted(monthly_data.keys()):
+        data = monthly_data[month]
         data["net"] = data["income"] - data["expenses"]
         trend.append(data)
 
@@ -205,51 +246,140 @@ async def get_income_vs_expenses_trend(
 
 
 @router.get("/account-balances")
-async def get_account_balances(db: AsyncSession = Depends(get_db)):
+async def get_account_balances(db: AsyncSession = Depends(get_read_db)):
     """Get balances for all accounts"""
-    result = await db.execute(select(Account).where(Account.is_active == 1))
-    accounts = result.scalars().all()
-
-    balances = []
-    for account in accounts:
-        balances.append({
-            "id": account.id,
-            "name": account.name,
-            "type": account.account_type.value,
-            "balance": account.balance,
-            "currency": account.currency
-        })
-
-    # Sort by balance descending
-    balances.sort(key=lambda x: abs(x["balance"]), reverse=True)
+    # Column-only select with the sort pushed into SQL; labels double as
+    # response keys so each row dict is built in C from the mapping
+    result = await db.execute(
+        select(
+            Account.id,
+            Account.name,
+            Account.account_type.label("type"),
+            Account.balance,
+            Account.currency,
+        )
+        .where(Account.is_active.is_(True))
+        .order_by(func.abs(Account.balance).desc())
+    )
 
-    return balances
+    return [dict(row) for row in result.mappings()]
 
 
 @router.get("/dashboard-summary")
-async def get_dashboard_summary(db: AsyncSession = Depends(get_db)):
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_read_db),
+    now: datetime = Depends(request_now)
+):
     """Get comprehensive dashboard summary"""
-    # Get net worth
-    net_worth_data = await get_net_worth(db)
-
-    # Get cash flow for current month
-    now = datetime.now()
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    cash_flow_data = await get_cash_flow(month_start, now, db)
 
-    # Get spending by category for current month
-    spending_data = await get_spending_by_category(month_start, now, db)
+    # All scalar aggregates in one round-trip via scalar subqueries
+    assets_sq = select(
+        func.coalesce(
+            func.sum(
+                case((Account.account_type.in_(ASSET_ACCOUNT_TYPES), Account.balance), else_=0.0)
+            ),
+            0.0,
+        )
+    ).scalar_subquery()
+    liabilities_sq = select(
+        func.coalesce(
+            func.sum(
+                case(
+                    (Account.account_type.in_(LIABILITY_ACCOUNT_TYPES), func.abs(Account.balance)),
+                    else_=0.0,
+                )
+            ),
+            0.0,
+        )
+    ).scalar_subquery()
+    income_sq = select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+        and_(
+            Transaction.transaction_type == TransactionType.INCOME,
+            Transaction.transaction_date >= month_start,
+            Transaction.transaction_date <= now,
+        )
+    ).scalar_subquery()
+    expenses_sq = select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(
+        and_(
+            Transaction.transaction_type == TransactionType.EXPENSE,
+            Transaction.transaction_date >= month_start,
+            Transaction.transaction_date <= now,
+        )
+    ).scalar_subquery()
+    # Counts come from the denormalized stats counters, not COUNT(*) scans
+    account_count_sq = func.coalesce(
+        select(Stat.value).where(Stat.key == ACTIVE_ACCOUNT_COUNT).scalar_subquery(), 0
+    )
+    txn_count_sq = func.coalesce(
+        select(Stat.value).where(Stat.key == month_key(now)).scalar_subquery(), 0
+    )
+
+    async def run_summary():
+        summary = (
+            await db.execute(
+                select(
+                    assets_sq.label("assets"),
+                    liabilities_sq.label("liabilities"),
+                    income_sq.label("income"),
+                    expenses_sq.label("expenses"),
+                    account_count_sq.label("account_count"),
+                    txn_count_sq.label("txn_count"),
+                )
+            )
+        ).one()
+
+        # Investment value still needs the market data service
+        inv_result = await db.execute(
+            select(
+                Investment.symbol,
+                Investment.exchange,
+                func.sum(Investment.quantity).label("total_quantity"),
+                func.avg(Investment.current_price).label("last_price"),
+            )
+            .group_by(Investment.symbol, Investment.exchange)
+        )
+        holdings = inv_result.all()
 
-    # Get account count
-    account_result = await db.execute(select(func.count(Account.id)).where(Account.is_active == 1))
-    account_count = account_result.scalar() or 0
+        investment_value = 0.0
+        if holdings:
+            symbols = [{"symbol": h.symbol, "exchange": h.exchange} for h in holdings]
+            prices = await MarketDataService.get_multiple_prices(symbols)
+            for h in holdings:
+                key = f"{h.symbol}:{h.exchange}"
+                current_price = prices.get(key) or h.last_price or 0.0
+                investment_value += h.total_quantity * current_price
 
-    # Get transaction count for current month
-    txn_result = await db.execute(
-        select(func.count(Transaction.id))
-        .where(Transaction.transaction_date >= month_start)
+        return summary, investment_value
+
+    async def run_spending():
+        async with read_session_maker() as session:
+            return await get_spending_by_category(month_start, now, session, now)
+
+    (summary, investment_value), spending_data = await asyncio.gather(
+        run_summary(), run_spending()
     )
-    transaction_count = txn_result.scalar() or 0
+
+    assets = float(summary.assets) + investment_value
+    liabilities = float(summary.liabilities)
+    total_income = float(summary.income)
+    total_expenses = float(summary.expenses)
+
+    net_worth_data = {
+        "net_worth": assets - liabilities,
+        "total_assets": assets,
+        "total_liabilities": liabilities,
+        "timestamp": now.isoformat()
+    }
+    cash_flow_data = {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_cash_flow": total_income - total_expenses,
+        "start_date": month_start.isoformat(),
+        "end_date": now.isoformat()
+    }
+    account_count = summary.account_count or 0
+    transaction_count = summary.txn_count or 0
 
     return {
         "net_worth": net_worth_data,
@@ -257,5 +387,5 @@ async def get_dashboard_summary(db: AsyncSession = Depends(get_db)):
         "current_month_spending": spending_data,
         "account_count": account_count,
         "current_month_transaction_count": transaction_count,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     }
@@ -1,24 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from typing import List
-from datetime import datetime, timedelta
+from sqlalchemy import select, and_, func, bindparam, lambda_stmt
+from typing import Dict, List
+from datetime import datetime, timedelta, timezone
 
 from app.database import get_db
 from app.models.budget import Budget
 from app.models.transaction import Transaction, TransactionType
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 router = APIRouter(prefix="/api/budgets", tags=["budgets"])
 
+# Precompiled by-id lookup; the compiled SQL is cached on the lambda
+budget_by_id_stmt = lambda_stmt(
+    lambda: select(Budget).where(Budget.id == bindparam("budget_id"))
+)
+
 
 class BudgetCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     category: str
     amount: float
     period: str = "monthly"
 
 
 class BudgetUpdate(BaseModel):
+    # No extra="forbid" here: the edit form posts its full form state, so
+    # unknown keys (category, ...) must stay ignored
+    model_config = ConfigDict(frozen=True)
+
     amount: float | None = None
     period: str | None = None
 
@@ -29,19 +40,41 @@ async def get_budgets(db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Budget))
     budgets = result.scalars().all()
 
-    # Update spent amounts based on current period
+    # Group budgets by period so each period needs only one grouped query;
+    # resolve 'now' once so every period shares the same snapshot
+    now = datetime.now()
+    by_period: Dict[str, List[Budget]] = {}
     for budget in budgets:
-        spent = await calculate_budget_spent(db, budget.category, budget.period)
-        budget.spent = spent
+        by_period.setdefault(budget.period, []).append(budget)
+
+    for period, period_budgets in by_period.items():
+        start_date = get_period_start(period, now)
+        categories = [budget.category for budget in period_budgets]
+
+        result = await db.execute(
+            select(Transaction.category, func.sum(Transaction.amount))
+            .where(
+                and_(
+                    Transaction.category.in_(categories),
+                    Transaction.transaction_type == TransactionType.EXPENSE,
+                    Transaction.transaction_date >= start_date
+                )
+            )
+            .group_by(Transaction.category)
+        )
+        spent_by_category = {category: float(total) for category, total in result}
 
-    await db.flush()
+        for budget in period_budgets:
+            budget.spent = spent_by_category.get(budget.category, 0.0)
+
+    # Build the response before the flush at commit time expires updated_at
     return [budget.to_dict() for budget in budgets]
 
 
 @router.get("/{budget_id}")
 async def get_budget(budget_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific budget"""
-    result = await db.execute(select(Budget).where(Budget.id == budget_id))
+    result = await db.execute(budget_by_id_stmt, {"budget_id": budget_id})
     budget = result.scalar_one_or_none()
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
@@ -49,7 +82,6 @@ async def get_budget(budget_id: int, db: AsyncSession = Depends(get_db)):
     # Update spent amount
     spent = await calculate_budget_spent(db, budget.category, budget.period)
     budget.spent = spent
-    await db.flush()
 
     return budget.to_dict()
 
@@ -64,9 +96,10 @@ async def create_budget(budget_data: BudgetCreate, db: AsyncSession = Depends(ge
         raise HTTPException(status_code=400, detail="Budget for this category already exists")
 
     budget = Budget(**budget_data.model_dump())
+    # Set the timestamp locally so no refresh SELECT is needed for the response
+    budget.created_at = datetime.now(timezone.utc)
     db.add(budget)
     await db.flush()
-    await db.refresh(budget)
     return budget.to_dict()
 
 
@@ -77,7 +110,7 @@ async def update_budget(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a budget"""
-    result = await db.execute(select(Budget).where(Budget.id == budget_id))
+    result = await db.execute(budget_by_id_stmt, {"budget_id": budget_id})
     budget = result.scalar_one_or_none()
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
@@ -85,15 +118,15 @@ async def update_budget(
     for key, value in budget_data.model_dump(exclude_unset=True).items():
         setattr(budget, key, value)
 
+    budget.updated_at = datetime.now(timezone.utc)
     await db.flush()
-    await db.refresh(budget)
     return budget.to_dict()
 
 
 @router.delete("/{budget_id}")
 async def delete_budget(budget_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a budget"""
-    result = await db.execute(select(Budget).where(Budget.id == budget_id))
+    result = await db.execute(budget_by_id_stmt, {"budget_id": budget_id})
     budget = result.scalar_one_or_none()
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
@@ -102,16 +135,21 @@ async def delete_budget(budget_id: int, db: AsyncSession = Depends(get_db)):
     return {"message": "Budget deleted successfully"}
 
 
-async def calculate_budget_spent(db: AsyncSession, category: str, period: str) -> float:
-    """Calculate total spending for a budget category in the current period"""
-    now = datetime.now()
+def get_period_start(period: str, now: datetime | None = None) -> datetime:
+    """Get the start of the budget period containing 'now'"""
+    if now is None:
+        now = datetime.now()
 
     if period == "monthly":
-        start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     elif period == "yearly":
-        start_date = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-    else:
-        start_date = now - timedelta(days=30)  # Default to 30 days
+        return now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return now - timedelta(days=30)  # Default to 30 days
+
+
+async def calculate_budget_spent(db: AsyncSession, category: str, period: str) -> float:
+    """Calculate total spending for a budget category in the current period"""
+    start_date = get_period_start(period)
 
     result = await db.execute(
         select(func.sum(Transaction.amount))
@@ -1,15 +1,43 @@
+import io
+from collections import Counter, defaultdict
+
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from sqlalchemy import bindparam, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.account import Account
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionTag
 from app.models.investment import Investment
+from app.models.stats import ACTIVE_ACCOUNT_COUNT, month_key, stat_delta_stmt
 from app.utils.csv_import import CSVImporter
 
 router = APIRouter(prefix="/api/import", tags=["import"])
 
 
+async def _drop_unknown_accounts(db: AsyncSession, rows: list, errors: list) -> list:
+    """Split off rows referencing accounts that do not exist.
+
+    Bulk inserts hit the foreign key check as one statement, so a single bad
+    account_id would abort the whole import; validate up front instead and
+    report the skipped rows in the response.
+    """
+    wanted = {row["account_id"] for row in rows}
+    if not wanted:
+        return rows
+    result = await db.execute(select(Account.id).where(Account.id.in_(wanted)))
+    known = set(result.scalars().all())
+    unknown = wanted - known
+    if not unknown:
+        return rows
+    for account_id in sorted(unknown):
+        skipped = sum(1 for row in rows if row["account_id"] == account_id)
+        errors.append(
+            f"Account {account_id} does not exist ({skipped} rows skipped)"
+        )
+    return [row for row in rows if row["account_id"] in known]
+
+
 @router.post("/transactions/csv")
 async def import_transactions_csv(
     file: UploadFile = File(...),
@@ -19,32 +47,68 @@ async def import_transactions_csv(
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
-    content = await file.read()
-    csv_content = content.decode('utf-8')
-
-    transactions_data = CSVImporter.parse_transaction_csv(csv_content)
-
-    imported = 0
     errors = []
-
-    for txn_data in transactions_data:
-        try:
-            # Convert tags list to comma-separated string
-            if "tags" in txn_data:
-                txn_data["tags"] = ",".join(txn_data["tags"])
-
-            transaction = Transaction(**txn_data)
-            db.add(transaction)
-            imported += 1
-        except Exception as e:
-            errors.append(f"Error importing transaction: {str(e)}")
-
-    await db.flush()
+    # Parse straight off the spooled upload instead of buffering bytes + str
+    stream = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+    try:
+        transactions_data = list(
+            CSVImporter.parse_transaction_stream(stream, errors)
+        )
+    finally:
+        # Leave closing the upload to FastAPI, not the wrapper's GC
+        stream.detach()
+
+    total_rows = len(transactions_data)
+    transactions_data = await _drop_unknown_accounts(db, transactions_data, errors)
+
+    # Single executemany instead of one INSERT per row; Core inserts bypass
+    # the ORM counter events, so adjust the monthly counters here
+    if transactions_data:
+        # Tags go to their own table; keep them aside, keyed by insert order
+        tags_per_row = [t.pop("tags", []) for t in transactions_data]
+        result = await db.execute(
+            insert(Transaction).returning(
+                Transaction.id, sort_by_parameter_order=True
+            ),
+            transactions_data
+        )
+        tag_rows = [
+            {"transaction_id": txn_id, "tag": tag}
+            for txn_id, tags in zip(result.scalars().all(), tags_per_row)
+            for tag in dict.fromkeys(tags)
+        ]
+        if tag_rows:
+            await db.execute(insert(TransactionTag), tag_rows)
+
+        months = Counter(month_key(t["transaction_date"]) for t in transactions_data)
+        for key, delta in months.items():
+            await db.execute(stat_delta_stmt(key, delta))
+
+        # Apply the net balance change per account in one executemany UPDATE,
+        # mirroring what create_transaction does row by row
+        balance_deltas = defaultdict(float)
+        for t in transactions_data:
+            if t["transaction_type"] == "income":
+                balance_deltas[t["account_id"]] += t["amount"]
+            elif t["transaction_type"] == "expense":
+                balance_deltas[t["account_id"]] -= t["amount"]
+
+        delta_rows = [
+            {"acct_id": acct_id, "delta": delta}
+            for acct_id, delta in balance_deltas.items() if delta
+        ]
+        if delta_rows:
+            await db.execute(
+                update(Account.__table__)
+                .where(Account.__table__.c.id == bindparam("acct_id"))
+                .values(balance=Account.__table__.c.balance + bindparam("delta")),
+                delta_rows
+            )
 
     return {
-        "imported": imported,
+        "imported": len(transactions_data),
         "errors": errors,
-        "total_rows": len(transactions_data)
+        "total_rows": total_rows
     }
 
 
@@ -57,26 +121,20 @@ async def import_accounts_csv(
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
-    content = await file.read()
-    csv_content = content.decode('utf-8')
-
-    accounts_data = CSVImporter.parse_account_csv(csv_content)
-
-    imported = 0
     errors = []
+    stream = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+    try:
+        accounts_data = list(CSVImporter.parse_account_stream(stream, errors))
+    finally:
+        # Leave closing the upload to FastAPI, not the wrapper's GC
+        stream.detach()
 
-    for acc_data in accounts_data:
-        try:
-            account = Account(**acc_data)
-            db.add(account)
-            imported += 1
-        except Exception as e:
-            errors.append(f"Error importing account: {str(e)}")
-
-    await db.flush()
+    if accounts_data:
+        await db.execute(insert(Account), accounts_data)
+        await db.execute(stat_delta_stmt(ACTIVE_ACCOUNT_COUNT, len(accounts_data)))
 
     return {
-        "imported": imported,
+        "imported": len(accounts_data),
         "errors": errors,
         "total_rows": len(accounts_data)
     }
@@ -91,28 +149,26 @@ async def import_investments_csv(
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
-    content = await file.read()
-    csv_content = content.decode('utf-8')
-
-    investments_data = CSVImporter.parse_investment_csv(csv_content)
-
-    imported = 0
     errors = []
+    stream = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+    try:
+        investments_data = list(
+            CSVImporter.parse_investment_stream(stream, errors)
+        )
+    finally:
+        # Leave closing the upload to FastAPI, not the wrapper's GC
+        stream.detach()
 
-    for inv_data in investments_data:
-        try:
-            investment = Investment(**inv_data)
-            db.add(investment)
-            imported += 1
-        except Exception as e:
-            errors.append(f"Error importing investment: {str(e)}")
+    total_rows = len(investments_data)
+    investments_data = await _drop_unknown_accounts(db, investments_data, errors)
 
-    await db.flush()
+    if investments_data:
+        await db.execute(insert(Investment), investments_data)
 
     return {
-        "imported": imported,
+        "imported": len(investments_data),
         "errors": errors,
-        "total_rows": len(investments_data)
+        "total_rows": total_rows
     }
 
 
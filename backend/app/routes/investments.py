@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, bindparam
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List
 from datetime import datetime
+import asyncio
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.investment import Investment
 from app.models.account import Account
 from app.services.market_data import MarketDataService
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, computed_field
 
 router = APIRouter(prefix="/api/investments", tags=["investments"])
 
@@ -31,13 +34,58 @@ class InvestmentUpdate(BaseModel):
     name: str | None = None
 
 
-@router.get("")
+class InvestmentRead(BaseModel):
+    """Response schema; serialized straight off ORM rows by pydantic-core"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    account_id: int
+    symbol: str
+    name: str | None
+    asset_type: str
+    exchange: str | None
+    quantity: float
+    purchase_price: float
+    current_price: float | None
+    currency: str | None
+    purchase_date: datetime | None
+    created_at: datetime | None
+    updated_at: datetime | None
+
+    @computed_field
+    @property
+    def cost_basis(self) -> float:
+        return self.quantity * self.purchase_price
+
+    @computed_field
+    @property
+    def current_value(self) -> float:
+        return self.quantity * (self.current_price or 0.0)
+
+    @computed_field
+    @property
+    def gain_loss(self) -> float:
+        return self.current_value - self.cost_basis
+
+    @computed_field
+    @property
+    def gain_loss_percentage(self) -> float:
+        if self.cost_basis > 0:
+            return self.gain_loss / self.cost_basis * 100
+        return 0.0
+
+
+@router.get("", response_model=List[InvestmentRead])
 async def get_investments(
     account_id: int | None = None,
     db: AsyncSession = Depends(get_db)
 ):
     """Get all investments"""
-    query = select(Investment)
+    # Make the eager load explicit and fail fast on any stray lazy load
+    query = select(Investment).options(
+        selectinload(Investment.account),
+        raiseload("*")
+    )
     if account_id:
         query = query.where(Investment.account_id == account_id)
 
@@ -47,18 +95,35 @@ async def get_investments(
     # Update current prices
     if investments:
         symbols = [{"symbol": inv.symbol, "exchange": inv.exchange} for inv in investments]
+        # Release the sole write connection before going to the network; a
+        # slow quote fetch must not stall every other request on the pool.
+        # The bulk UPDATE below runs in a fresh short transaction.
+        await db.commit()
         prices = await MarketDataService.get_multiple_prices(symbols)
 
+        rows = []
         for inv in investments:
-            key = f"{inv.symbol}:{inv.exchange}"
-            inv.current_price = prices.get(key, inv.current_price)
-
-        await db.flush()
-
-    return [inv.to_dict() for inv in investments]
-
-
-@router.get("/{investment_id}")
+            price = prices.get(f"{inv.symbol}:{inv.exchange}")
+            if price and price != inv.current_price:
+                rows.append({"investment_id": inv.id, "current_price": price})
+                # Refresh the loaded value without dirtying the object; the
+                # bulk UPDATE below is what persists it
+                set_committed_value(inv, "current_price", price)
+
+        if rows:
+            # One executemany UPDATE instead of a unit-of-work UPDATE per row.
+            # Core-level statement: the ORM objects were already synced above.
+            await db.execute(
+                update(Investment.__table__)
+                .where(Investment.__table__.c.id == bindparam("investment_id"))
+                .values(current_price=bindparam("current_price")),
+                rows
+            )
+
+    return investments
+
+
+@router.get("/{investment_id}", response_model=InvestmentRead)
 async def get_investment(investment_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific investment"""
     result = await db.execute(select(Investment).where(Investment.id == investment_id))
@@ -66,7 +131,9 @@ async def get_investment(investment_id: int, db: AsyncSession = Depends(get_db))
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
 
-    # Update current price
+    # Release the sole write connection before going to the network; the
+    # price write below reopens a short transaction
+    await db.commit()
     current_price = await MarketDataService.get_current_price(
         investment.symbol,
         investment.exchange
@@ -74,10 +141,10 @@ async def get_investment(investment_id: int, db: AsyncSession = Depends(get_db))
     investment.current_price = current_price
     await db.flush()
 
-    return investment.to_dict()
+    return investment
 
 
-@router.post("")
+@router.post("", response_model=InvestmentRead)
 async def create_investment(
     investment_data: InvestmentCreate,
     db: AsyncSession = Depends(get_db)
@@ -89,61 +156,84 @@ async def create_investment(
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    # Fetch current price and info if name not provided
+    # Release the sole write connection before going to the network; the
+    # insert below reopens a short transaction
+    await db.commit()
+
+    # Fetch info (when no name was given) and the current price concurrently
+    # instead of paying two sequential network round-trips
     if not investment_data.name:
-        info = await MarketDataService.get_ticker_info(
+        info, current_price = await asyncio.gather(
+            MarketDataService.get_ticker_info(
+                investment_data.symbol,
+                investment_data.exchange
+            ),
+            MarketDataService.get_current_price(
+                investment_data.symbol,
+                investment_data.exchange
+            )
+        )
+        investment_data.name = info["name"]
+    else:
+        current_price = await MarketDataService.get_current_price(
             investment_data.symbol,
             investment_data.exchange
         )
-        investment_data.name = info["name"]
 
     investment = Investment(**investment_data.model_dump())
-
-    # Set current price
-    investment.current_price = await MarketDataService.get_current_price(
-        investment.symbol,
-        investment.exchange
-    )
+    investment.current_price = current_price
 
     db.add(investment)
     await db.flush()
     await db.refresh(investment)
-    return investment.to_dict()
+    return investment
 
 
-@router.put("/{investment_id}")
+@router.put("/{investment_id}", response_model=InvestmentRead)
 async def update_investment(
     investment_id: int,
     investment_data: InvestmentUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Update an investment"""
-    result = await db.execute(select(Investment).where(Investment.id == investment_id))
+    patch = investment_data.model_dump(exclude_unset=True)
+    if not patch:
+        result = await db.execute(select(Investment).where(Investment.id == investment_id))
+        investment = result.scalar_one_or_none()
+        if not investment:
+            raise HTTPException(status_code=404, detail="Investment not found")
+        return investment
+
+    # Single round-trip: update and fetch the new row together
+    result = await db.execute(
+        update(Investment)
+        .where(Investment.id == investment_id)
+        .values(**patch)
+        .returning(Investment)
+        .execution_options(synchronize_session=False)
+    )
     investment = result.scalar_one_or_none()
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
-
-    for key, value in investment_data.model_dump(exclude_unset=True).items():
-        setattr(investment, key, value)
-
-    await db.flush()
-    await db.refresh(investment)
-    return investment.to_dict()
+    return investment
 
 
 @router.delete("/{investment_id}")
 async def delete_investment(investment_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an investment"""
-    result = await db.execute(select(Investment).where(Investment.id == investment_id))
-    investment = result.scalar_one_or_none()
-    if not investment:
+    # One DELETE round-trip; RETURNING doubles as the existence check
+    result = await db.execute(
+        delete(Investment)
+        .where(Investment.id == investment_id)
+        .returning(Investment.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Investment not found")
-
-    await db.delete(investment)
     return {"message": "Investment deleted successfully"}
 
 
-@router.post("/{investment_id}/refresh-price")
+@router.post("/{investment_id}/refresh-price", response_model=InvestmentRead)
 async def refresh_investment_price(investment_id: int, db: AsyncSession = Depends(get_db)):
     """Manually refresh the current price of an investment"""
     result = await db.execute(select(Investment).where(Investment.id == investment_id))
@@ -151,6 +241,12 @@ async def refresh_investment_price(investment_id: int, db: AsyncSession = Depend
     if not investment:
         raise HTTPException(status_code=404, detail="Investment not found")
 
+    # Release the sole write connection before going to the network; the
+    # price write below reopens a short transaction
+    await db.commit()
+
+    # Manual refresh must bypass the TTL cache
+    MarketDataService.invalidate(investment.symbol, investment.exchange)
     current_price = await MarketDataService.get_current_price(
         investment.symbol,
         investment.exchange
@@ -159,16 +255,25 @@ async def refresh_investment_price(investment_id: int, db: AsyncSession = Depend
     await db.flush()
     await db.refresh(investment)
 
-    return investment.to_dict()
+    return investment
 
 
 @router.get("/portfolio/summary")
-async def get_portfolio_summary(db: AsyncSession = Depends(get_db)):
+async def get_portfolio_summary(db: AsyncSession = Depends(get_read_db)):
     """Get portfolio summary with total value and gains/losses"""
-    result = await db.execute(select(Investment))
-    investments = result.scalars().all()
+    # Read-only: use the read pool so the quote fetch below never holds
+    # the single write connection
+    # Aggregate in SQL instead of hydrating every Investment row
+    total_cost, holdings_count = (
+        await db.execute(
+            select(
+                func.coalesce(func.sum(Investment.quantity * Investment.purchase_price), 0.0),
+                func.count(Investment.id)
+            )
+        )
+    ).one()
 
-    if not investments:
+    if not holdings_count:
         return {
             "total_value": 0.0,
             "total_cost": 0.0,
@@ -177,22 +282,26 @@ async def get_portfolio_summary(db: AsyncSession = Depends(get_db)):
             "holdings_count": 0
         }
 
-    # Update all prices
-    symbols = [{"symbol": inv.symbol, "exchange": inv.exchange} for inv in investments]
+    # One row per distinct ticker; stored_value is the fallback when a live
+    # price is unavailable
+    holdings = (
+        await db.execute(
+            select(
+                Investment.symbol,
+                Investment.exchange,
+                func.sum(Investment.quantity).label("quantity"),
+                func.sum(Investment.quantity * Investment.current_price).label("stored_value")
+            ).group_by(Investment.symbol, Investment.exchange)
+        )
+    ).all()
+
+    symbols = [{"symbol": row.symbol, "exchange": row.exchange} for row in holdings]
     prices = await MarketDataService.get_multiple_prices(symbols)
 
     total_value = 0.0
-    total_cost = 0.0
-
-    for inv in investments:
-        key = f"{inv.symbol}:{inv.exchange}"
-        inv.current_price = prices.get(key, inv.current_price)
-        await db.flush()
-
-        cost = inv.quantity * inv.purchase_price
-        value = inv.quantity * inv.current_price
-        total_cost += cost
-        total_value += value
+    for row in holdings:
+        price = prices.get(f"{row.symbol}:{row.exchange}")
+        total_value += row.quantity * price if price else row.stored_value
 
     total_gain_loss = total_value - total_cost
     total_gain_loss_pct = (total_gain_loss / total_cost * 100) if total_cost > 0 else 0
@@ -202,7 +311,7 @@ async def get_portfolio_summary(db: AsyncSession = Depends(get_db)):
         "total_cost": total_cost,
         "total_gain_loss": total_gain_loss,
         "total_gain_loss_percentage": total_gain_loss_pct,
-        "holdings_count": len(investments)
+        "holdings_count": holdings_count
     }
 
 
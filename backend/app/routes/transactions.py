@@ -1,16 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, update, delete, insert
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List
 from datetime import datetime
+import time
 
 from app.database import get_db
-from app.models.transaction import Transaction, TransactionType
+from app.models.transaction import Transaction, TransactionTag, TransactionType
 from app.models.account import Account
-from pydantic import BaseModel
+from app.models.stats import month_key, stat_delta_stmt
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
+# The distinct-category list changes rarely; keep it in memory briefly and
+# drop it whenever a transaction is written
+CATEGORY_CACHE_TTL = 60.0  # seconds
+_category_cache: tuple[List[str], float] | None = None
+
+
+def _invalidate_category_cache() -> None:
+    global _category_cache
+    _category_cache = None
+
 
 class TransactionCreate(BaseModel):
     account_id: int
@@ -32,31 +46,75 @@ class TransactionUpdate(BaseModel):
     transaction_date: datetime | None = None
 
 
-@router.get("")
+class TransactionRead(BaseModel):
+    """Response schema; serialized straight off ORM rows by pydantic-core"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    account_id: int
+    transaction_type: TransactionType
+    amount: float
+    category: str | None
+    merchant: str | None
+    description: str | None
+    tags: List[str] = Field(validation_alias="tag_rows")
+    transaction_date: datetime
+    created_at: datetime | None
+    updated_at: datetime | None
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _tag_names(cls, value):
+        return [getattr(row, "tag", row) for row in value]
+
+
+@router.get("", response_model=List[TransactionRead])
 async def get_transactions(
     account_id: int | None = None,
     category: str | None = None,
+    tag: str | None = None,
     transaction_type: TransactionType | None = None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    before: datetime | None = None,
     limit: int = Query(default=100, le=1000),
     offset: int = 0,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get transactions with optional filters"""
-    query = select(Transaction)
+    """
+    Get transactions with optional filters.
+
+    For deep pagination pass the last page's oldest transaction_date as
+    `before` instead of growing `offset` — the cursor stays an index range
+    scan while OFFSET re-reads every skipped row.
+    """
+    # Load tags in one batched SELECT; any other relationship access in the
+    # serialization loop is a bug, so make it raise instead of lazy-loading
+    query = select(Transaction).options(
+        selectinload(Transaction.tag_rows),
+        raiseload("*")
+    )
 
     filters = []
     if account_id:
         filters.append(Transaction.account_id == account_id)
     if category:
         filters.append(Transaction.category == category)
+    if tag:
+        # Index-backed membership test against the normalized tag table
+        filters.append(
+            Transaction.id.in_(
+                select(TransactionTag.transaction_id).where(TransactionTag.tag == tag)
+            )
+        )
     if transaction_type:
         filters.append(Transaction.transaction_type == transaction_type)
     if start_date:
         filters.append(Transaction.transaction_date >= start_date)
     if end_date:
         filters.append(Transaction.transaction_date <= end_date)
+    if before:
+        filters.append(Transaction.transaction_date < before)
 
     if filters:
         query = query.where(and_(*filters))
@@ -64,21 +122,20 @@ async def get_transactions(
     query = query.order_by(Transaction.transaction_date.desc()).limit(limit).offset(offset)
 
     result = await db.execute(query)
-    transactions = result.scalars().all()
-    return [txn.to_dict() for txn in transactions]
+    return result.scalars().all()
 
 
-@router.get("/{transaction_id}")
+@router.get("/{transaction_id}", response_model=TransactionRead)
 async def get_transaction(transaction_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific transaction"""
     result = await db.execute(select(Transaction).where(Transaction.id == transaction_id))
     transaction = result.scalar_one_or_none()
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    return transaction.to_dict()
+    return transaction
 
 
-@router.post("")
+@router.post("", response_model=TransactionRead)
 async def create_transaction(
     transaction_data: TransactionCreate,
     db: AsyncSession = Depends(get_db)
@@ -90,11 +147,11 @@ async def create_transaction(
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
-    # Create transaction
-    txn_dict = transaction_data.model_dump()
-    txn_dict["tags"] = ",".join(transaction_data.tags) if transaction_data.tags else ""
-
-    transaction = Transaction(**txn_dict)
+    # Create transaction; tags become child rows in transaction_tags
+    payload = transaction_data.model_dump()
+    tags = payload.pop("tags", [])
+    transaction = Transaction(**payload)
+    transaction.tag_rows = [TransactionTag(tag=t) for t in dict.fromkeys(tags)]
     db.add(transaction)
 
     # Update account balance
@@ -105,61 +162,135 @@ async def create_transaction(
 
     await db.flush()
     await db.refresh(transaction)
-    return transaction.to_dict()
+    _invalidate_category_cache()
+    return transaction
 
 
-@router.put("/{transaction_id}")
+@router.put("/{transaction_id}", response_model=TransactionRead)
 async def update_transaction(
     transaction_id: int,
     transaction_data: TransactionUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Update a transaction"""
-    result = await db.execute(select(Transaction).where(Transaction.id == transaction_id))
+    patch = transaction_data.model_dump(exclude_unset=True)
+
+    # Direct UPDATE ... RETURNING bypasses the ORM counter events, so grab
+    # the old date first when the month counter may need to move
+    old_date = None
+    if "transaction_date" in patch:
+        result = await db.execute(
+            select(Transaction.transaction_date).where(Transaction.id == transaction_id)
+        )
+        old_date = result.scalar_one_or_none()
+        if old_date is None:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+
+    # Tags live in their own table and are replaced wholesale when given
+    tags = patch.pop("tags", None)
+
+    if patch:
+        # Single round-trip: update and fetch the new row together
+        result = await db.execute(
+            update(Transaction)
+            .where(Transaction.id == transaction_id)
+            .values(**patch)
+            .returning(Transaction)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        result = await db.execute(
+            select(Transaction).where(Transaction.id == transaction_id)
+        )
     transaction = result.scalar_one_or_none()
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    update_dict = transaction_data.model_dump(exclude_unset=True)
-    if "tags" in update_dict and update_dict["tags"]:
-        update_dict["tags"] = ",".join(update_dict["tags"])
+    if tags is not None:
+        await db.execute(
+            delete(TransactionTag)
+            .where(TransactionTag.transaction_id == transaction_id)
+            .execution_options(synchronize_session=False)
+        )
+        tags = list(dict.fromkeys(tags))
+        if tags:
+            await db.execute(
+                insert(TransactionTag),
+                [{"transaction_id": transaction_id, "tag": t} for t in tags]
+            )
+        set_committed_value(transaction, "tag_rows", [TransactionTag(transaction_id=transaction_id, tag=t) for t in tags])
 
-    for key, value in update_dict.items():
-        setattr(transaction, key, value)
+    if "category" in patch:
+        _invalidate_category_cache()
 
-    await db.flush()
-    await db.refresh(transaction)
-    return transaction.to_dict()
+    if old_date is not None:
+        old_key = month_key(old_date)
+        new_key = month_key(transaction.transaction_date)
+        if old_key != new_key:
+            await db.execute(stat_delta_stmt(old_key, -1))
+            await db.execute(stat_delta_stmt(new_key, 1))
+
+    return transaction
 
 
 @router.delete("/{transaction_id}")
 async def delete_transaction(transaction_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a transaction"""
-    result = await db.execute(select(Transaction).where(Transaction.id == transaction_id))
-    transaction = result.scalar_one_or_none()
-    if not transaction:
+    # Delete and read back what is needed for the balance reversal in one
+    # round-trip instead of SELECT + SELECT + DELETE
+    result = await db.execute(
+        delete(Transaction)
+        .where(Transaction.id == transaction_id)
+        .returning(
+            Transaction.amount,
+            Transaction.transaction_type,
+            Transaction.account_id,
+            Transaction.transaction_date
+        )
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
     # Reverse the balance change
-    result = await db.execute(select(Account).where(Account.id == transaction.account_id))
-    account = result.scalar_one_or_none()
-    if account:
-        if transaction.transaction_type == TransactionType.INCOME:
-            account.balance -= transaction.amount
-        elif transaction.transaction_type == TransactionType.EXPENSE:
-            account.balance += transaction.amount
+    if row.transaction_type == TransactionType.INCOME:
+        balance_delta = -row.amount
+    elif row.transaction_type == TransactionType.EXPENSE:
+        balance_delta = row.amount
+    else:
+        balance_delta = 0.0
 
-    await db.delete(transaction)
+    if balance_delta:
+        await db.execute(
+            update(Account.__table__)
+            .where(Account.__table__.c.id == row.account_id)
+            .values(balance=Account.__table__.c.balance + balance_delta)
+        )
+
+    # The ORM after_delete counter event never fires for a Core DELETE
+    await db.execute(stat_delta_stmt(month_key(row.transaction_date), -1))
+
+    _invalidate_category_cache()
     return {"message": "Transaction deleted successfully"}
 
 
 @router.get("/categories/list")
 async def get_categories(db: AsyncSession = Depends(get_db)):
     """Get all unique categories"""
+    global _category_cache
+    if _category_cache is not None:
+        categories, cached_at = _category_cache
+        if time.monotonic() - cached_at <= CATEGORY_CACHE_TTL:
+            return categories
+
+    # DISTINCT resolves as a loose scan over ix_tx_cat_type_date, which
+    # leads on category
     result = await db.execute(
         select(Transaction.category)
         .where(Transaction.category.isnot(None))
         .distinct()
     )
     categories = [row[0] for row in result.all()]
+    _category_cache = (categories, time.monotonic())
     return categories
@@ -1,15 +1,128 @@
 import yfinance as yf
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 
+logger = logging.getLogger(__name__)
+
 
 class MarketDataService:
     """Service for fetching stock market data from US and India markets"""
 
+    # Process-level price cache: "SYMBOL:EXCHANGE" -> (price, fetched_at)
+    PRICE_CACHE_TTL = 60.0  # seconds
+    PRICE_CACHE_MAXSIZE = 10_000
+    _price_cache: Dict[str, Tuple[float, float]] = {}
+    _price_locks: Dict[str, asyncio.Lock] = {}
+
+    # Ticker metadata changes rarely, so it gets a much longer TTL
+    INFO_CACHE_TTL = 86_400.0  # seconds
+    _info_cache: Dict[str, Tuple[Dict, float]] = {}
+
+    # Disk tier under the in-memory cache: survives restarts and is shared
+    # across uvicorn workers without needing Redis. Wall-clock timestamps so
+    # entries stay comparable between processes.
+    DISK_CACHE_PATH = "market_cache.db"
+    DISK_CACHE_TTL = 300.0  # seconds
+    _disk_conn: sqlite3.Connection | None = None
+    _disk_lock = threading.Lock()
+
+    # Dedicated pool so bursts of blocking yfinance calls never queue behind
+    # the small default executor shared with the rest of the app; the
+    # semaphore caps in-flight requests because Yahoo throttles aggressively
+    _executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="yf")
+    _fetch_semaphore = asyncio.Semaphore(30)
+
+    @classmethod
+    async def _run_fetch(cls, func):
+        """Run a blocking yfinance call on the dedicated executor"""
+        async with cls._fetch_semaphore:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(cls._executor, func)
+
+    @classmethod
+    def _get_cached_price(cls, key: str) -> float | None:
+        """Return a cached price if it is still fresh"""
+        entry = cls._price_cache.get(key)
+        if entry is None:
+            return None
+        price, fetched_at = entry
+        if time.monotonic() - fetched_at > cls.PRICE_CACHE_TTL:
+            return None
+        return price
+
+    @classmethod
+    def _store_cached_price(cls, key: str, price: float) -> None:
+        """Cache a fetched price, evicting stale entries if the cache is full"""
+        if len(cls._price_cache) >= cls.PRICE_CACHE_MAXSIZE:
+            now = time.monotonic()
+            for stale_key in [
+                k for k, (_, fetched_at) in cls._price_cache.items()
+                if now - fetched_at > cls.PRICE_CACHE_TTL
+            ]:
+                cls._price_cache.pop(stale_key, None)
+                cls._price_locks.pop(stale_key, None)
+        cls._price_cache[key] = (price, time.monotonic())
+
+    @classmethod
+    def _disk(cls) -> sqlite3.Connection:
+        """Open (once) the shared on-disk price cache"""
+        if cls._disk_conn is None:
+            conn = sqlite3.connect(cls.DISK_CACHE_PATH, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS prices (
+                    symbol TEXT NOT NULL,
+                    exchange TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (symbol, exchange)
+                )"""
+            )
+            conn.commit()
+            cls._disk_conn = conn
+        return cls._disk_conn
+
+    @classmethod
+    def _disk_get_many(cls, pairs: List[Tuple[str, str]]) -> Dict[str, float]:
+        """Fetch still-fresh prices for (symbol, exchange) pairs from disk"""
+        cutoff = time.time() - cls.DISK_CACHE_TTL
+        result = {}
+        with cls._disk_lock:
+            conn = cls._disk()
+            for symbol, exchange in pairs:
+                row = conn.execute(
+                    "SELECT price FROM prices"
+                    " WHERE symbol = ? AND exchange = ? AND fetched_at > ?",
+                    (symbol, exchange, cutoff)
+                ).fetchone()
+                if row is not None:
+                    result[f"{symbol}:{exchange}"] = row[0]
+        return result
+
+    @classmethod
+    def _disk_put(cls, symbol: str, exchange: str, price: float) -> None:
+        """Write a fetched price through to the disk tier"""
+        with cls._disk_lock:
+            conn = cls._disk()
+            conn.execute(
+                "INSERT INTO prices (symbol, exchange, price, fetched_at)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (symbol, exchange) DO UPDATE SET"
+                " price = excluded.price, fetched_at = excluded.fetched_at",
+                (symbol, exchange, price, time.time())
+            )
+            conn.commit()
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def get_ticker_symbol(symbol: str, exchange: str = "US") -> str:
-        """Format ticker symbol based on exchange"""
+        """Format ticker symbol based on exchange (pure, so memoized)"""
         if exchange.upper() in ["NSE", "INDIA"]:
             # Indian stocks on NSE
             return f"{symbol}.NS"
@@ -21,58 +134,185 @@ class MarketDataService:
             return symbol
 
     @staticmethod
-    async def get_current_price(symbol: str, exchange: str = "US") -> float:
-        """Get current price for a single ticker"""
+    async def _fetch_price(symbol: str, exchange: str = "US") -> float:
+        """Fetch one price from yfinance (no caching)"""
         try:
             ticker_symbol = MarketDataService.get_ticker_symbol(symbol, exchange)
             ticker = yf.Ticker(ticker_symbol)
 
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(None, lambda: ticker.info)
-
-            # Try different price fields
-            price = (
-                info.get("currentPrice") or
-                info.get("regularMarketPrice") or
-                info.get("previousClose") or
-                0.0
-            )
-            return float(price)
+            # fast_info hits a small quote endpoint instead of the ~50KB
+            # summary JSON behind ticker.info
+            def read_fast_price() -> float:
+                fast_info = ticker.fast_info
+                for field in ("last_price", "previous_close"):
+                    try:
+                        value = getattr(fast_info, field)
+                    except (KeyError, AttributeError):
+                        continue
+                    if value:
+                        return float(value)
+                return 0.0
+
+            # Run on the market-data pool to avoid blocking
+            return await MarketDataService._run_fetch(read_fast_price)
         except Exception as e:
-            print(f"Error fetching price for {symbol}: {e}")
+            logger.warning("Price fetch failed for %s:%s: %s", symbol, exchange, e)
             return 0.0
 
+    @staticmethod
+    async def get_current_price(symbol: str, exchange: str = "US") -> float:
+        """Get current price for a single ticker, cached for PRICE_CACHE_TTL"""
+        cls = MarketDataService
+        key = f"{symbol}:{exchange}"
+        cached = cls._get_cached_price(key)
+        if cached is not None:
+            return cached
+
+        # Coalesce concurrent misses for the same symbol into one fetch
+        lock = cls._price_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = cls._get_cached_price(key)
+            if cached is not None:
+                return cached
+
+            # Second tier: another worker may have fetched this recently
+            on_disk = await asyncio.to_thread(
+                cls._disk_get_many, [(symbol, exchange)]
+            )
+            if key in on_disk:
+                cls._store_cached_price(key, on_disk[key])
+                return on_disk[key]
+
+            price = await cls._fetch_price(symbol, exchange)
+            if price:
+                cls._store_cached_price(key, price)
+                await asyncio.to_thread(cls._disk_put, symbol, exchange, price)
+            return price
+
+    @staticmethod
+    async def _fetch_prices_batch(pairs: List[Tuple[str, str]]) -> Dict[str, float]:
+        """Fetch prices for many tickers with one bulk yf.download call"""
+        tickers = {
+            MarketDataService.get_ticker_symbol(symbol, exchange): (symbol, exchange)
+            for symbol, exchange in pairs
+        }
+        try:
+            df = await MarketDataService._run_fetch(
+                lambda: yf.download(
+                    " ".join(tickers),
+                    period="1d",
+                    progress=False,
+                    threads=True,
+                    group_by="ticker"
+                )
+            )
+        except Exception as e:
+            logger.warning("Batch price fetch failed for %d tickers: %s", len(tickers), e)
+            return {}
+
+        result = {}
+        for ticker_symbol, (symbol, exchange) in tickers.items():
+            try:
+                close = df["Close"] if len(tickers) == 1 else df[ticker_symbol]["Close"]
+                close = close.dropna()
+                if not close.empty:
+                    result[f"{symbol}:{exchange}"] = float(close.iloc[-1])
+            except (KeyError, IndexError):
+                continue
+        return result
+
     @staticmethod
     async def get_multiple_prices(symbols: List[Dict[str, str]]) -> Dict[str, float]:
         """
-        Get current prices for multiple tickers
+        Get current prices for multiple tickers, serving fresh cache entries
+        without a network round-trip.
         symbols: List of dicts with 'symbol' and 'exchange' keys
         """
-        tasks = [
-            MarketDataService.get_current_price(item["symbol"], item.get("exchange", "US"))
-            for item in symbols
-        ]
-        prices = await asyncio.gather(*tasks)
-
+        cls = MarketDataService
         result = {}
-        for item, price in zip(symbols, prices):
-            key = f"{item['symbol']}:{item.get('exchange', 'US')}"
-            result[key] = price
+        misses = []
+
+        for item in symbols:
+            symbol, exchange = item["symbol"], item.get("exchange", "US")
+            key = f"{symbol}:{exchange}"
+            if key in result or (symbol, exchange) in misses:
+                continue
+            cached = cls._get_cached_price(key)
+            if cached is not None:
+                result[key] = cached
+            else:
+                misses.append((symbol, exchange))
+
+        if misses:
+            # Second tier: prices another worker fetched recently
+            on_disk = await asyncio.to_thread(cls._disk_get_many, misses)
+            for key, price in on_disk.items():
+                cls._store_cached_price(key, price)
+            result.update(on_disk)
+            misses = [
+                (symbol, exchange) for symbol, exchange in misses
+                if f"{symbol}:{exchange}" not in on_disk
+            ]
+
+        if misses:
+            # One bulk request for all misses instead of N info round-trips
+            fetched = await cls._fetch_prices_batch(misses)
+            for key, price in fetched.items():
+                if price:
+                    cls._store_cached_price(key, price)
+                    symbol, _, exchange = key.rpartition(":")
+                    await asyncio.to_thread(cls._disk_put, symbol, exchange, price)
+            result.update(fetched)
+
+            # Per-ticker fallback only for symbols the bulk response omitted
+            leftovers = [
+                (symbol, exchange) for symbol, exchange in misses
+                if f"{symbol}:{exchange}" not in fetched
+            ]
+            if leftovers:
+                prices = await asyncio.gather(
+                    *(
+                        cls.get_current_price(symbol, exchange)
+                        for symbol, exchange in leftovers
+                    )
+                )
+                for (symbol, exchange), price in zip(leftovers, prices):
+                    result[f"{symbol}:{exchange}"] = price
 
         return result
 
+    @classmethod
+    def invalidate(cls, symbol: str, exchange: str = "US") -> None:
+        """Drop cached data for a symbol so the next lookup hits the network"""
+        key = f"{symbol}:{exchange}"
+        cls._price_cache.pop(key, None)
+        cls._info_cache.pop(key, None)
+        with cls._disk_lock:
+            conn = cls._disk()
+            conn.execute(
+                "DELETE FROM prices WHERE symbol = ? AND exchange = ?",
+                (symbol, exchange)
+            )
+            conn.commit()
+
     @staticmethod
     async def get_ticker_info(symbol: str, exchange: str = "US") -> Dict:
-        """Get detailed information about a ticker"""
+        """Get detailed information about a ticker, cached for INFO_CACHE_TTL"""
+        cls = MarketDataService
+        key = f"{symbol}:{exchange}"
+        entry = cls._info_cache.get(key)
+        if entry is not None:
+            info, fetched_at = entry
+            if time.monotonic() - fetched_at <= cls.INFO_CACHE_TTL:
+                return info
+
         try:
             ticker_symbol = MarketDataService.get_ticker_symbol(symbol, exchange)
             ticker = yf.Ticker(ticker_symbol)
 
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(None, lambda: ticker.info)
+            info = await cls._run_fetch(lambda: ticker.info)
 
-            return {
+            result = {
                 "symbol": symbol,
                 "name": info.get("longName") or info.get("shortName") or symbol,
                 "exchange": exchange,
@@ -82,8 +322,10 @@ class MarketDataService:
                 "sector": info.get("sector"),
                 "industry": info.get("industry"),
             }
+            cls._info_cache[key] = (result, time.monotonic())
+            return result
         except Exception as e:
-            print(f"Error fetching info for {symbol}: {e}")
+            logger.warning("Info fetch failed for %s:%s: %s", symbol, exchange, e)
             return {
                 "symbol": symbol,
                 "name": symbol,
@@ -97,8 +339,7 @@ class MarketDataService:
         """Search for tickers by name or symbol"""
         try:
             ticker = yf.Ticker(query)
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(None, lambda: ticker.info)
+            info = await MarketDataService._run_fetch(lambda: ticker.info)
 
             if info:
                 return [{
@@ -1,17 +1,84 @@
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict
-import csv
+from typing import IO, Iterator, List, Dict, Optional
+import logging
+import warnings
 from io import StringIO
 
+logger = logging.getLogger(__name__)
+
 
 class CSVImporter:
     """Utility for importing transactions and accounts from CSV files"""
 
+    # Rows handed to pandas per chunk when parsing an upload stream
+    CSV_CHUNK_ROWS = 10_000
+
+    @staticmethod
+    def _read_chunks(fp: IO[str], kind: str, errors: list) -> Iterator[pd.DataFrame]:
+        """Yield CSV chunks, tolerating empty files and ragged lines.
+
+        A ragged line would make the C parser shift columns and poison the
+        whole chunk, so bad lines are skipped instead, with the count reported
+        through the errors list. An empty upload simply yields nothing rather
+        than raising EmptyDataError.
+        """
+        try:
+            reader = pd.read_csv(
+                fp, chunksize=CSVImporter.CSV_CHUNK_ROWS, on_bad_lines="warn"
+            )
+        except pd.errors.EmptyDataError:
+            return
+
+        while True:
+            # Bad lines surface as ParserWarning per line; collect them here
+            # so the skip count reaches the response, not just the log
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", pd.errors.ParserWarning)
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except pd.errors.ParserError as e:
+                    logger.warning("%s CSV is malformed: %s", kind, e)
+                    errors.append(f"{kind} CSV is malformed: {e}")
+                    return
+            bad_lines = sum(
+                1 for w in caught if issubclass(w.category, pd.errors.ParserWarning)
+            )
+            if bad_lines:
+                logger.warning(
+                    "Skipped %d malformed %s rows", bad_lines, kind.lower()
+                )
+                errors.append(f"Skipped {bad_lines} malformed rows")
+            yield chunk
+
+    @staticmethod
+    def _required_present(
+        chunk: pd.DataFrame, required: set, kind: str, errors: list
+    ) -> bool:
+        """Log and reject a chunk whose header lacks required columns"""
+        missing = required - set(chunk.columns)
+        if missing:
+            logger.warning("%s CSV missing columns: %s", kind, sorted(missing))
+            errors.append(f"{kind} CSV missing columns: {sorted(missing)}")
+            return False
+        return True
+
+    @staticmethod
+    def _optional_column(chunk: pd.DataFrame, name: str, default=None) -> list:
+        """Column values with NaN replaced by the default, or all-default"""
+        if name not in chunk.columns:
+            return [default] * len(chunk)
+        return chunk[name].astype(object).where(chunk[name].notna(), default).tolist()
+
     @staticmethod
-    def parse_transaction_csv(csv_content: str) -> List[Dict]:
+    def parse_transaction_stream(
+        fp: IO[str], errors: Optional[list] = None
+    ) -> Iterator[Dict]:
         """
-        Parse transaction CSV. Expected columns:
+        Lazily parse transactions from a text stream, coercing dtypes with
+        vectorized pandas operations per chunk. Expected columns:
         - date (YYYY-MM-DD)
         - amount (float)
         - type (income/expense/transfer)
@@ -19,65 +86,139 @@ class CSVImporter:
         - merchant (optional)
         - description (optional)
         - account_id (int)
+
+        Skipped-row counts and format problems are appended to the errors
+        list when one is passed in.
         """
-        transactions = []
-        reader = csv.DictReader(StringIO(csv_content))
-
-        for row in reader:
-            try:
-                transaction = {
-                    "transaction_date": datetime.fromisoformat(row["date"]),
-                    "amount": float(row["amount"]),
-                    "transaction_type": row["type"].lower(),
-                    "account_id": int(row["account_id"]),
-                    "category": row.get("category"),
-                    "merchant": row.get("merchant"),
-                    "description": row.get("description"),
-                    "tags": row.get("tags", "").split(",") if row.get("tags") else []
-                }
-                transactions.append(transaction)
-            except (KeyError, ValueError) as e:
-                print(f"Error parsing row: {row}, error: {e}")
+        if errors is None:
+            errors = []
+        for chunk in CSVImporter._read_chunks(fp, "Transaction", errors):
+            if not CSVImporter._required_present(
+                chunk, {"date", "amount", "type", "account_id"}, "Transaction", errors
+            ):
                 continue
 
-        return transactions
+            total = len(chunk)
+            chunk["date"] = pd.to_datetime(chunk["date"], errors="coerce")
+            chunk["amount"] = pd.to_numeric(chunk["amount"], errors="coerce")
+            chunk["account_id"] = pd.to_numeric(chunk["account_id"], errors="coerce")
+            chunk = chunk.dropna(subset=["date", "amount", "type", "account_id"])
+            if len(chunk) < total:
+                logger.warning(
+                    "Skipping %d unparseable transaction rows", total - len(chunk)
+                )
+                errors.append(f"Skipped {total - len(chunk)} unparseable rows")
+
+            if "tags" in chunk.columns:
+                tag_lists = (
+                    chunk["tags"].fillna("").astype(str).str.split(",")
+                    .map(lambda tags: [t for t in tags if t])
+                    .tolist()
+                )
+            else:
+                tag_lists = [[] for _ in range(len(chunk))]
+
+            yield from (
+                {
+                    "transaction_date": date.to_pydatetime(),
+                    "amount": amount,
+                    "transaction_type": txn_type,
+                    "account_id": account_id,
+                    "category": category,
+                    "merchant": merchant,
+                    "description": description,
+                    "tags": tags,
+                }
+                for date, amount, txn_type, account_id, category, merchant, description, tags in zip(
+                    chunk["date"],
+                    chunk["amount"].tolist(),
+                    chunk["type"].astype(str).str.lower().tolist(),
+                    chunk["account_id"].astype("int64").tolist(),
+                    CSVImporter._optional_column(chunk, "category"),
+                    CSVImporter._optional_column(chunk, "merchant"),
+                    CSVImporter._optional_column(chunk, "description"),
+                    tag_lists,
+                )
+            )
+
+    @staticmethod
+    def parse_transaction_csv(
+        csv_content: str, errors: Optional[list] = None
+    ) -> List[Dict]:
+        """Parse a transaction CSV held in memory (see parse_transaction_stream)"""
+        return list(
+            CSVImporter.parse_transaction_stream(StringIO(csv_content), errors)
+        )
 
     @staticmethod
-    def parse_account_csv(csv_content: str) -> List[Dict]:
+    def parse_account_stream(
+        fp: IO[str], errors: Optional[list] = None
+    ) -> Iterator[Dict]:
         """
-        Parse account CSV. Expected columns:
+        Lazily parse accounts from a text stream, coercing dtypes with
+        vectorized pandas operations per chunk. Expected columns:
         - name
         - account_type (checking/savings/credit_card/investment/crypto/loan/other)
         - balance (float)
         - currency (optional, defaults to USD)
         - institution (optional)
         - account_number (optional)
+
+        Skipped-row counts and format problems are appended to the errors
+        list when one is passed in.
         """
-        accounts = []
-        reader = csv.DictReader(StringIO(csv_content))
-
-        for row in reader:
-            try:
-                account = {
-                    "name": row["name"],
-                    "account_type": row["account_type"].lower(),
-                    "balance": float(row["balance"]),
-                    "currency": row.get("currency", "USD"),
-                    "institution": row.get("institution"),
-                    "account_number": row.get("account_number"),
-                    "notes": row.get("notes")
-                }
-                accounts.append(account)
-            except (KeyError, ValueError) as e:
-                print(f"Error parsing row: {row}, error: {e}")
+        if errors is None:
+            errors = []
+        for chunk in CSVImporter._read_chunks(fp, "Account", errors):
+            if not CSVImporter._required_present(
+                chunk, {"name", "account_type", "balance"}, "Account", errors
+            ):
                 continue
 
-        return accounts
+            total = len(chunk)
+            chunk["balance"] = pd.to_numeric(chunk["balance"], errors="coerce")
+            chunk = chunk.dropna(subset=["name", "account_type", "balance"])
+            if len(chunk) < total:
+                logger.warning(
+                    "Skipping %d unparseable account rows", total - len(chunk)
+                )
+                errors.append(f"Skipped {total - len(chunk)} unparseable rows")
+
+            yield from (
+                {
+                    "name": name,
+                    "account_type": account_type,
+                    "balance": balance,
+                    "currency": currency,
+                    "institution": institution,
+                    "account_number": account_number,
+                    "notes": notes,
+                }
+                for name, account_type, balance, currency, institution, account_number, notes in zip(
+                    chunk["name"].astype(str).tolist(),
+                    chunk["account_type"].astype(str).str.lower().tolist(),
+                    chunk["balance"].tolist(),
+                    CSVImporter._optional_column(chunk, "currency", "USD"),
+                    CSVImporter._optional_column(chunk, "institution"),
+                    CSVImporter._optional_column(chunk, "account_number"),
+                    CSVImporter._optional_column(chunk, "notes"),
+                )
+            )
+
+    @staticmethod
+    def parse_account_csv(
+        csv_content: str, errors: Optional[list] = None
+    ) -> List[Dict]:
+        """Parse an account CSV held in memory (see parse_account_stream)"""
+        return list(CSVImporter.parse_account_stream(StringIO(csv_content), errors))
 
     @staticmethod
-    def parse_investment_csv(csv_content: str) -> List[Dict]:
+    def parse_investment_stream(
+        fp: IO[str], errors: Optional[list] = None
+    ) -> Iterator[Dict]:
         """
-        Parse investment CSV. Expected columns:
+        Lazily parse investments from a text stream, coercing dtypes with
+        vectorized pandas operations per chunk. Expected columns:
         - symbol
         - name (optional)
         - asset_type (stock/etf/mutual_fund/crypto)
@@ -87,32 +228,83 @@ class CSVImporter:
         - purchase_date (YYYY-MM-DD, optional)
         - account_id (int)
         - currency (optional, defaults to USD)
+
+        Skipped-row counts and format problems are appended to the errors
+        list when one is passed in.
         """
-        investments = []
-        reader = csv.DictReader(StringIO(csv_content))
-
-        for row in reader:
-            try:
-                investment = {
-                    "symbol": row["symbol"].upper(),
-                    "name": row.get("name"),
-                    "asset_type": row["asset_type"].lower(),
-                    "exchange": row.get("exchange", "US").upper(),
-                    "quantity": float(row["quantity"]),
-                    "purchase_price": float(row["purchase_price"]),
-                    "account_id": int(row["account_id"]),
-                    "currency": row.get("currency", "USD"),
-                }
+        if errors is None:
+            errors = []
+        for chunk in CSVImporter._read_chunks(fp, "Investment", errors):
+            if not CSVImporter._required_present(
+                chunk,
+                {"symbol", "asset_type", "quantity", "purchase_price", "account_id"},
+                "Investment",
+                errors
+            ):
+                continue
 
-                if row.get("purchase_date"):
-                    investment["purchase_date"] = datetime.fromisoformat(row["purchase_date"])
+            total = len(chunk)
+            chunk["quantity"] = pd.to_numeric(chunk["quantity"], errors="coerce")
+            chunk["purchase_price"] = pd.to_numeric(chunk["purchase_price"], errors="coerce")
+            chunk["account_id"] = pd.to_numeric(chunk["account_id"], errors="coerce")
+            chunk = chunk.dropna(
+                subset=["symbol", "asset_type", "quantity", "purchase_price", "account_id"]
+            )
+            if len(chunk) < total:
+                logger.warning(
+                    "Skipping %d unparseable investment rows", total - len(chunk)
+                )
+                errors.append(f"Skipped {total - len(chunk)} unparseable rows")
 
-                investments.append(investment)
-            except (KeyError, ValueError) as e:
-                print(f"Error parsing row: {row}, error: {e}")
-                continue
+            # Always emitted so bulk inserts see uniform keys
+            if "purchase_date" in chunk.columns:
+                purchase_dates = [
+                    ts.to_pydatetime() if pd.notna(ts) else None
+                    for ts in pd.to_datetime(chunk["purchase_date"], errors="coerce")
+                ]
+            else:
+                purchase_dates = [None] * len(chunk)
 
-        return investments
+            if "exchange" in chunk.columns:
+                exchanges = (
+                    chunk["exchange"].fillna("US").astype(str).str.upper().tolist()
+                )
+            else:
+                exchanges = ["US"] * len(chunk)
+
+            yield from (
+                {
+                    "symbol": symbol,
+                    "name": name,
+                    "asset_type": asset_type,
+                    "exchange": exchange,
+                    "quantity": quantity,
+                    "purchase_price": purchase_price,
+                    "account_id": account_id,
+                    "currency": currency,
+                    "purchase_date": purchase_date,
+                }
+                for symbol, name, asset_type, exchange, quantity, purchase_price, account_id, currency, purchase_date in zip(
+                    chunk["symbol"].astype(str).str.upper().tolist(),
+                    CSVImporter._optional_column(chunk, "name"),
+                    chunk["asset_type"].astype(str).str.lower().tolist(),
+                    exchanges,
+                    chunk["quantity"].tolist(),
+                    chunk["purchase_price"].tolist(),
+                    chunk["account_id"].astype("int64").tolist(),
+                    CSVImporter._optional_column(chunk, "currency", "USD"),
+                    purchase_dates,
+                )
+            )
+
+    @staticmethod
+    def parse_investment_csv(
+        csv_content: str, errors: Optional[list] = None
+    ) -> List[Dict]:
+        """Parse an investment CSV held in memory (see parse_investment_stream)"""
+        return list(
+            CSVImporter.parse_investment_stream(StringIO(csv_content), errors)
+        )
 
     @staticmethod
     def generate_transaction_template() -> str: